@@ -11,11 +11,22 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
+import io
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from utils.databricks_connector import query_databricks_table
 
 # Optional: Uncomment these imports when connecting to Databricks resources
-# from databricks import sql
 # from databricks.sdk import WorkspaceClient
 
+# Source table for the Databricks data sources - update with your table details
+DATA_CATALOG = "your_catalog"
+DATA_SCHEMA = "your_schema"
+DATA_TABLE = "your_table"
+DATA_COLUMNS = ["date", "sales", "revenue", "customers", "region"]
+
 # Page configuration
 st.set_page_config(
     page_title="Databricks Streamlit Template",
@@ -39,45 +50,167 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def generate_sample_data():
     """Generate sample data for demonstration purposes."""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq='D')
+    regions = ['North', 'South', 'East', 'West']
 
     data = pd.DataFrame({
         'date': dates,
-        'sales': np.random.randint(100, 1000, size=len(dates)),
-        'revenue': np.random.uniform(1000, 10000, size=len(dates)),
-        'customers': np.random.randint(10, 100, size=len(dates)),
-        'region': np.random.choice(['North', 'South', 'East', 'West'], size=len(dates))
+        'sales': rng.integers(100, 1000, size=len(dates), dtype=np.int32),
+        'revenue': rng.uniform(1000, 10000, size=len(dates)).astype(np.float32, copy=False),
+        'customers': rng.integers(10, 100, size=len(dates), dtype=np.int32),
+        'region': pd.Categorical.from_codes(rng.integers(0, len(regions), size=len(dates)), categories=regions)
     })
 
     return data
 
 
-def load_data_from_databricks():
+def build_filter_clause(start_date=None, end_date=None, regions=None):
     """
-    Load data from Databricks SQL warehouse or Unity Catalog.
-    Uncomment and configure when deploying to Databricks.
+    Build a parameterized SQL WHERE clause (without the WHERE keyword) for the sidebar filters.
+
+    Returns:
+        Tuple of the clause, using named :param markers, and its parameter values
     """
-    # Example connection to Databricks SQL warehouse
-    # connection = sql.connect(
-    #     server_hostname=os.getenv("DATABRICKS_SERVER_HOSTNAME"),
-    #     http_path=os.getenv("DATABRICKS_HTTP_PATH"),
-    #     access_token=os.getenv("DATABRICKS_TOKEN")
-    # )
-    #
-    # cursor = connection.cursor()
-    # cursor.execute("SELECT * FROM your_catalog.your_schema.your_table")
-    # df = cursor.fetchall_arrow().to_pandas()
-    # cursor.close()
-    # connection.close()
-    # return df
-
-    # For now, return sample data
+    conditions = []
+    parameters = {}
+
+    if start_date is not None and end_date is not None:
+        # Half-open range so TIMESTAMP columns keep every row on the end day
+        conditions.append("date >= :start_date AND date < :end_date")
+        parameters['start_date'] = start_date
+        parameters['end_date'] = end_date + timedelta(days=1)
+
+    if regions is not None:
+        if regions:
+            names = [f"region_{i}" for i in range(len(regions))]
+            conditions.append(f"region IN ({', '.join(':' + name for name in names)})")
+            parameters.update(zip(names, regions))
+        else:
+            conditions.append("1 = 0")
+
+    return " AND ".join(conditions), parameters
+
+
+def load_sample_data(start_date=None, end_date=None, regions=None):
+    """Load the sample data; filters are applied by the caller."""
     return generate_sample_data()
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_data_from_databricks(start_date=None, end_date=None, regions=None):
+    """
+    Load data from Databricks SQL warehouse or Unity Catalog.
+    Configure DATA_CATALOG, DATA_SCHEMA and DATA_TABLE when deploying to Databricks.
+
+    Date and region filters are pushed down into the SQL query so the
+    warehouse only returns matching rows and columns. Raises RuntimeError
+    if the Databricks query fails, so the failure is not cached.
+    """
+    filters, parameters = build_filter_clause(start_date, end_date, regions)
+    table = query_databricks_table(
+        catalog=DATA_CATALOG,
+        schema=DATA_SCHEMA,
+        table=DATA_TABLE,
+        filters=filters,
+        columns=DATA_COLUMNS,
+        parameters=parameters
+    )
+    if table is None:
+        raise RuntimeError(f"Could not query {DATA_CATALOG}.{DATA_SCHEMA}.{DATA_TABLE}")
+
+    # Dictionary-encode region so it converts to a Categorical like the sample data
+    region_idx = table.schema.get_field_index('region')
+    table = table.set_column(region_idx, 'region', pc.dictionary_encode(table['region']))
+    df = table.to_pandas(date_as_object=False, split_blocks=True)
+
+    # DATE arrives as datetime64 above; drop the zone from TIMESTAMP columns too
+    if isinstance(df['date'].dtype, pd.DatetimeTZDtype):
+        df['date'] = df['date'].dt.tz_convert(None)
+
+    # Reductions and bincounts stream each numeric column, so keep them C-contiguous
+    for column in df.select_dtypes('number').columns:
+        values = df[column].to_numpy()
+        if not values.flags['C_CONTIGUOUS']:
+            df[column] = np.ascontiguousarray(values)
+
+    return df
+
+
+# Loader for each data source, resolved once at import time
+DATA_LOADERS = {
+    "Sample Data": load_sample_data,
+    "Databricks SQL Warehouse": load_data_from_databricks,
+    "Unity Catalog": load_data_from_databricks,
+}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_sales_fig(df: pd.DataFrame) -> go.Figure:
+    """Build the daily sales trend line chart."""
+    # Aggregate to one point per day so the line size is independent of row count
+    daily_sales = df.set_index('date')['sales'].resample('D').sum().reset_index()
+    fig = go.Figure(go.Scatter(
+        x=daily_sales['date'].to_numpy(),
+        y=daily_sales['sales'].to_numpy(),
+        mode='lines'
+    ))
+    fig.update_layout(
+        title='Daily Sales Trend',
+        xaxis_title='Date',
+        yaxis_title='Sales',
+        height=400
+    )
+    return fig
+
+
+def build_region_fig(df: pd.DataFrame) -> go.Figure:
+    """Build the revenue by region pie chart."""
+    # region is categorical, so per-region totals are a bincount over its codes
+    region = df['region'].cat
+    codes = region.codes.to_numpy()
+    has_region = codes >= 0
+    num_regions = len(region.categories)
+    # Treat NULL revenue as 0 so it is skipped like groupby().sum() and the headline metric do
+    weights = np.nan_to_num(df['revenue'].to_numpy()[has_region])
+    revenue = np.bincount(codes[has_region], weights=weights, minlength=num_regions)
+    observed = np.bincount(codes[has_region], minlength=num_regions) > 0
+    fig = go.Figure(go.Pie(
+        labels=region.categories.to_numpy()[observed],
+        values=revenue[observed]
+    ))
+    fig.update_layout(title='Revenue Distribution by Region', height=400)
+    return fig
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_scatter_fig(df: pd.DataFrame, render_mode: str = 'webgl') -> go.Figure:
+    """Build the revenue vs customers scatter plot ('webgl' or 'svg' render mode)."""
+    fig = px.scatter(
+        df,
+        x='customers',
+        y='revenue',
+        color='region',
+        size='sales',
+        title='Revenue vs Customer Count by Region',
+        labels={'customers': 'Number of Customers', 'revenue': 'Revenue ($)'},
+        render_mode=render_mode
+    )
+    fig.update_layout(height=500)
+    return fig
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def convert_df_to_csv(df: pd.DataFrame) -> bytes:
+    """Encode a DataFrame as CSV bytes using Arrow's native CSV writer."""
+    buffer = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    return buffer.getvalue()
+
+
 def main():
     """Main application logic."""
 
@@ -89,7 +222,7 @@ def main():
         # Data source selection
         data_source = st.selectbox(
             "Select Data Source",
-            ["Sample Data", "Databricks SQL Warehouse", "Unity Catalog"]
+            list(DATA_LOADERS)
         )
 
         # Date range filter
@@ -106,6 +239,14 @@ def main():
             default=["North", "South", "East", "West"]
         )
 
+        # Chart rendering
+        st.subheader("Display")
+        use_webgl = st.toggle(
+            "Use WebGL for scatter plots",
+            value=True,
+            help="Disable to fall back to SVG rendering on systems without WebGL support"
+        )
+
         # Refresh button
         if st.button("🔄 Refresh Data", use_container_width=True):
             st.cache_data.clear()
@@ -116,29 +257,39 @@ def main():
     st.markdown("A template application for visualizing data in Databricks Apps")
 
     # Load data
-    with st.spinner("Loading data..."):
-        df = load_data_from_databricks()
-
-    # Filter data based on sidebar selections
+    start_date, end_date = date_range if len(date_range) == 2 else (None, None)
+    try:
+        with st.spinner("Loading data..."):
+            df = DATA_LOADERS[data_source](start_date, end_date, tuple(regions))
+    except RuntimeError:
+        st.warning(f"Could not load data from {data_source}. Showing sample data instead.")
+        df = generate_sample_data()
+
+    # Filter data based on sidebar selections in a single pass
+    mask = df['region'].isin(regions).to_numpy()
     if len(date_range) == 2:
-        df = df[(df['date'].dt.date >= date_range[0]) & (df['date'].dt.date <= date_range[1])]
+        dates = df['date'].to_numpy()
+        mask = mask & (dates >= np.datetime64(date_range[0])) & (dates < np.datetime64(date_range[1] + timedelta(days=1)))
 
-    df = df[df['region'].isin(regions)]
+    df = df.loc[mask]
 
     # Key metrics
     st.subheader("📈 Key Metrics")
     col1, col2, col3, col4 = st.columns(4)
 
+    # Compute all headline metrics in a single aggregation
+    metrics = df.agg({'sales': 'sum', 'revenue': 'sum', 'customers': 'mean'})
+    total_sales = int(metrics['sales'])
+    total_revenue = metrics['revenue']
+    avg_customers = metrics['customers']
+
     with col1:
-        total_sales = df['sales'].sum()
         st.metric("Total Sales", f"{total_sales:,}", delta=f"{int(total_sales * 0.1):,}")
 
     with col2:
-        total_revenue = df['revenue'].sum()
         st.metric("Total Revenue", f"${total_revenue:,.2f}", delta=f"${total_revenue * 0.15:,.2f}")
 
     with col3:
-        avg_customers = df['customers'].mean()
         st.metric("Avg Daily Customers", f"{avg_customers:.0f}", delta=f"{int(avg_customers * 0.05)}")
 
     with col4:
@@ -152,57 +303,32 @@ def main():
 
     with col1:
         st.subheader("Sales Over Time")
-        fig_sales = px.line(
-            df,
-            x='date',
-            y='sales',
-            title='Daily Sales Trend',
-            labels={'sales': 'Sales', 'date': 'Date'}
-        )
-        fig_sales.update_layout(height=400)
-        st.plotly_chart(fig_sales, use_container_width=True)
+        st.plotly_chart(build_sales_fig(df), use_container_width=True)
 
     with col2:
         st.subheader("Revenue by Region")
-        region_revenue = df.groupby('region')['revenue'].sum().reset_index()
-        fig_region = px.pie(
-            region_revenue,
-            values='revenue',
-            names='region',
-            title='Revenue Distribution by Region'
-        )
-        fig_region.update_layout(height=400)
-        st.plotly_chart(fig_region, use_container_width=True)
+        st.plotly_chart(build_region_fig(df), use_container_width=True)
 
     # Additional visualizations
     st.subheader("Revenue vs Customers Correlation")
-    fig_scatter = px.scatter(
-        df,
-        x='customers',
-        y='revenue',
-        color='region',
-        size='sales',
-        title='Revenue vs Customer Count by Region',
-        labels={'customers': 'Number of Customers', 'revenue': 'Revenue ($)'}
-    )
-    fig_scatter.update_layout(height=500)
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    st.plotly_chart(build_scatter_fig(df, 'webgl' if use_webgl else 'svg'), use_container_width=True)
 
     # Data table
     with st.expander("📋 View Raw Data"):
         st.dataframe(
-            df.style.format({
-                'revenue': '${:,.2f}',
-                'sales': '{:,}',
-                'customers': '{:,}'
-            }),
+            df,
+            column_config={
+                'revenue': st.column_config.NumberColumn(format='dollar'),
+                'sales': st.column_config.NumberColumn(format='localized'),
+                'customers': st.column_config.NumberColumn(format='localized')
+            },
             use_container_width=True
         )
 
     # Download data
     st.download_button(
         label="📥 Download Data as CSV",
-        data=df.to_csv(index=False).encode('utf-8'),
+        data=convert_df_to_csv(df),
         file_name=f'databricks_data_{datetime.now().strftime("%Y%m%d")}.csv',
         mime='text/csv',
     )
@@ -37,25 +37,30 @@ def generate_time_series_data(
     dates = pd.date_range(start=start_date, end=end_date, freq=freq)
     categories = [f'Category_{i+1}' for i in range(num_categories)]
 
-    data = []
-    for date in dates:
-        for category in categories:
-            # Add some trend and seasonality
-            trend = len(data) * 0.5
-            seasonal = 100 * np.sin(2 * np.pi * date.dayofyear / 365)
-            noise = np.random.normal(0, 50)
-
-            value = 1000 + trend + seasonal + noise
-
-            data.append({
-                'date': date,
-                'category': category,
-                'value': max(0, value),
-                'transactions': np.random.randint(50, 500),
-                'users': np.random.randint(10, 200)
-            })
+    rng = np.random.default_rng()
 
-    return pd.DataFrame(data)
+    num_dates = len(dates)
+    n = num_dates * num_categories
+
+    # One row per (date, category) pair, dates varying slowest
+    date_col = np.repeat(dates.values, num_categories)
+    category_col = pd.Categorical.from_codes(np.tile(np.arange(num_categories), num_dates), categories=categories)
+
+    # Add some trend and seasonality
+    trend = np.arange(n) * 0.5
+    # Seasonality only depends on the date, so evaluate it once per date
+    seasonal = np.repeat(100 * np.sin(2 * np.pi * dates.dayofyear.values / 365), num_categories)
+    noise = rng.normal(0, 50, n)
+
+    value = 1000 + trend + seasonal + noise
+
+    return pd.DataFrame({
+        'date': date_col,
+        'category': category_col,
+        'value': np.maximum(0, value),
+        'transactions': rng.integers(50, 500, size=n),
+        'users': rng.integers(10, 200, size=n)
+    })
 
 
 def generate_sales_data(
@@ -74,7 +79,7 @@ def generate_sales_data(
     Returns:
         DataFrame with sales data
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
 
     products = [f'Product_{i+1}' for i in range(num_products)]
     regions = [f'Region_{i+1}' for i in range(num_regions)]
@@ -82,18 +87,18 @@ def generate_sales_data(
 
     data = {
         'transaction_id': [f'TXN_{i:06d}' for i in range(num_records)],
-        'date': [datetime.now() - timedelta(days=np.random.randint(0, 365)) for _ in range(num_records)],
-        'product': np.random.choice(products, num_records),
-        'region': np.random.choice(regions, num_records),
-        'quantity': np.random.randint(1, 10, num_records),
-        'unit_price': np.random.uniform(10, 500, num_records),
-        'payment_method': np.random.choice(payment_methods, num_records)
+        'date': pd.Timestamp.now().normalize() - pd.to_timedelta(rng.integers(0, 365, num_records), unit='D'),
+        'product': pd.Categorical.from_codes(rng.integers(0, num_products, num_records), categories=products),
+        'region': pd.Categorical.from_codes(rng.integers(0, num_regions, num_records), categories=regions),
+        'quantity': rng.integers(1, 10, num_records, dtype=np.int32),
+        'unit_price': rng.uniform(10, 500, num_records).astype(np.float32, copy=False),
+        'payment_method': pd.Categorical.from_codes(rng.integers(0, len(payment_methods), num_records), categories=payment_methods)
     }
 
     df = pd.DataFrame(data)
-    df['total_amount'] = df['quantity'] * df['unit_price']
-    df['discount'] = np.random.choice([0, 0.05, 0.10, 0.15, 0.20], num_records, p=[0.5, 0.2, 0.15, 0.1, 0.05])
-    df['final_amount'] = df['total_amount'] * (1 - df['discount'])
+    df['total_amount'] = (df['quantity'] * df['unit_price']).astype(np.float32)
+    df['discount'] = rng.choice(np.array([0, 0.05, 0.10, 0.15, 0.20], dtype=np.float32), num_records, p=[0.5, 0.2, 0.15, 0.1, 0.05])
+    df['final_amount'] = (df['total_amount'] * (1 - df['discount'])).astype(np.float32)
 
     return df.sort_values('date', ascending=False).reset_index(drop=True)
 
@@ -108,7 +113,7 @@ def generate_customer_data(num_customers: int = 500) -> pd.DataFrame:
     Returns:
         DataFrame with customer data
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
 
     segments = ['Premium', 'Standard', 'Basic']
     statuses = ['Active', 'Inactive', 'Churned']
@@ -116,13 +121,13 @@ def generate_customer_data(num_customers: int = 500) -> pd.DataFrame:
 
     data = {
         'customer_id': [f'CUST_{i:05d}' for i in range(num_customers)],
-        'signup_date': [datetime.now() - timedelta(days=np.random.randint(0, 730)) for _ in range(num_customers)],
-        'segment': np.random.choice(segments, num_customers, p=[0.2, 0.5, 0.3]),
-        'status': np.random.choice(statuses, num_customers, p=[0.7, 0.2, 0.1]),
-        'country': np.random.choice(countries, num_customers),
-        'total_purchases': np.random.randint(1, 100, num_customers),
-        'lifetime_value': np.random.uniform(100, 10000, num_customers),
-        'average_order_value': np.random.uniform(20, 500, num_customers)
+        'signup_date': pd.Timestamp.now().normalize() - pd.to_timedelta(rng.integers(0, 730, num_customers), unit='D'),
+        'segment': pd.Categorical.from_codes(rng.choice(len(segments), num_customers, p=[0.2, 0.5, 0.3]), categories=segments),
+        'status': pd.Categorical.from_codes(rng.choice(len(statuses), num_customers, p=[0.7, 0.2, 0.1]), categories=statuses),
+        'country': pd.Categorical.from_codes(rng.integers(0, len(countries), num_customers), categories=countries),
+        'total_purchases': rng.integers(1, 100, num_customers),
+        'lifetime_value': rng.uniform(100, 10000, num_customers),
+        'average_order_value': rng.uniform(20, 500, num_customers)
     }
 
     return pd.DataFrame(data)
@@ -144,29 +149,35 @@ def generate_metrics_data(
     """
     dates = pd.date_range(start=datetime.now() - timedelta(days=num_days), end=datetime.now(), freq='D')
 
-    data = []
-    for i, date in enumerate(dates):
-        base_value = 1000
-        trend = i * 5
-        seasonal = 100 * np.sin(2 * np.pi * i / 7)  # Weekly seasonality
-        noise = np.random.normal(0, 50)
+    rng = np.random.default_rng()
 
-        value = base_value + trend + seasonal + noise
+    n = len(dates)
+    day = np.arange(n)
 
-        # Add anomalies if requested
-        if include_anomalies and np.random.random() < 0.05:
-            value *= np.random.choice([0.5, 2.0])  # 50% drop or 200% spike
+    # Draw every noise series in a single call and scale each row
+    noise, orders_noise, new_noise, returning_noise, conv_noise = (
+        rng.standard_normal((5, n)) * np.array([[50], [10], [5], [10], [0.005]])
+    )
 
-        data.append({
-            'date': date,
-            'revenue': max(0, value),
-            'orders': int(max(0, value / 50 + np.random.normal(0, 10))),
-            'new_customers': int(max(0, 20 + np.random.normal(0, 5))),
-            'returning_customers': int(max(0, 50 + np.random.normal(0, 10))),
-            'conversion_rate': min(1.0, max(0, 0.03 + np.random.normal(0, 0.005)))
-        })
+    base_value = 1000
+    trend = day * 5
+    seasonal = 100 * np.sin(2 * np.pi * day / 7)  # Weekly seasonality
 
-    return pd.DataFrame(data)
+    value = base_value + trend + seasonal + noise
+
+    # Add anomalies if requested
+    if include_anomalies:
+        is_anomaly = rng.random(n) < 0.05
+        value[is_anomaly] *= rng.choice([0.5, 2.0], np.count_nonzero(is_anomaly))  # 50% drop or 200% spike
+
+    return pd.DataFrame({
+        'date': dates,
+        'revenue': np.maximum(0, value).astype(np.float32),
+        'orders': np.maximum(0, value / 50 + orders_noise).astype(np.int32),
+        'new_customers': np.maximum(0, 20 + new_noise).astype(np.int32),
+        'returning_customers': np.maximum(0, 50 + returning_noise).astype(np.int32),
+        'conversion_rate': np.clip(0.03 + conv_noise, 0, 1.0).astype(np.float32)
+    })
 
 
 def generate_cohort_data(num_cohorts: int = 12) -> pd.DataFrame:
@@ -181,24 +192,23 @@ def generate_cohort_data(num_cohorts: int = 12) -> pd.DataFrame:
     """
     cohorts = pd.date_range(start=datetime.now() - timedelta(days=num_cohorts * 30), periods=num_cohorts, freq='MS')
 
-    data = []
-    for cohort_date in cohorts:
-        cohort_size = np.random.randint(100, 1000)
+    rng = np.random.default_rng()
 
-        for month in range(12):
-            # Retention decreases over time with some randomness
-            base_retention = 1.0 / (1 + month * 0.3)
-            retention = base_retention * np.random.uniform(0.8, 1.2)
-            retention = min(1.0, max(0, retention))
+    n = num_cohorts * 12
 
-            retained_users = int(cohort_size * retention)
+    # One row per (cohort, month) pair
+    months = np.tile(np.arange(12), num_cohorts)
+    cohort_idx = np.repeat(np.arange(num_cohorts), 12)
+    cohort_sizes = np.repeat(rng.integers(100, 1000, num_cohorts, dtype=np.int32), 12)
 
-            data.append({
-                'cohort': cohort_date,
-                'month': month,
-                'cohort_size': cohort_size,
-                'retained_users': retained_users,
-                'retention_rate': retention
-            })
+    # Retention decreases over time with some randomness
+    base_retention = 1.0 / (1 + months * 0.3)
+    retention = np.clip(base_retention * rng.uniform(0.8, 1.2, n), 0, 1.0)
 
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'cohort': cohorts.values[cohort_idx],
+        'month': months,
+        'cohort_size': cohort_sizes,
+        'retained_users': (cohort_sizes * retention).astype(np.int32),
+        'retention_rate': retention
+    })
@@ -5,15 +5,99 @@ This module provides helper functions to connect to Databricks resources
 such as SQL warehouses and Unity Catalog tables.
 """
 
+import atexit
 import os
-from typing import Optional
-import pandas as pd
+import queue
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, List
+import pyarrow as pa
+import streamlit as st
+
+# Maximum number of idle SQL warehouse connections kept open for reuse
+POOL_SIZE = 4
+
+
+def _connect():
+    """Open a new connection to the configured SQL warehouse."""
+    from databricks import sql
+
+    return sql.connect(
+        server_hostname=os.getenv("DATABRICKS_SERVER_HOSTNAME"),
+        http_path=os.getenv("DATABRICKS_HTTP_PATH"),
+        access_token=os.getenv("DATABRICKS_TOKEN")
+    )
+
+
+def _close_quietly(connection):
+    """Close a connection, ignoring errors from one that is already dead."""
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class _ConnectionPool:
+    """
+    Small pool of SQL warehouse connections shared by all Streamlit sessions.
+
+    DB-API connections must not be shared between threads and every
+    Streamlit session runs in its own thread, so each query checks out a
+    connection of its own and hands it back afterwards. Closed connections
+    are dropped instead of being reused.
+    """
+
+    def __init__(self, size: int):
+        self._idle = queue.LifoQueue(maxsize=size)
+        self.closed = False
+
+    def acquire(self):
+        """Return an open idle connection, or a new one if none is available."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return _connect()
+
+            if getattr(connection, "open", True):
+                return connection
+            _close_quietly(connection)
+
+    def release(self, connection):
+        """Return a connection to the pool, closing it if it cannot be reused."""
+        if self.closed or not getattr(connection, "open", True):
+            _close_quietly(connection)
+            return
+
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            _close_quietly(connection)
+
+    def close(self):
+        """Close every idle connection and stop accepting returned ones."""
+        self.closed = True
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+@st.cache_resource(show_spinner=False, validate=lambda pool: not pool.closed)
+def _get_connection_pool() -> _ConnectionPool:
+    """Create the process-wide connection pool; closed again on process exit."""
+    pool = _ConnectionPool(POOL_SIZE)
+    atexit.register(pool.close)
+    return pool
 
 
 def get_databricks_connection():
     """
     Create a connection to Databricks SQL warehouse.
 
+    The connection is not pooled; the caller owns it and should close it
+    when done. Use pooled_connection() to reuse connections across queries.
+
     Returns:
         connection object if successful, None otherwise
 
@@ -24,14 +108,7 @@ def get_databricks_connection():
         >>> df = cursor.fetchall_arrow().to_pandas()
     """
     try:
-        from databricks import sql
-
-        connection = sql.connect(
-            server_hostname=os.getenv("DATABRICKS_SERVER_HOSTNAME"),
-            http_path=os.getenv("DATABRICKS_HTTP_PATH"),
-            access_token=os.getenv("DATABRICKS_TOKEN")
-        )
-        return connection
+        return _connect()
     except ImportError:
         print("databricks-sql-connector not installed. Run: pip install databricks-sql-connector")
         return None
@@ -40,15 +117,62 @@ def get_databricks_connection():
         return None
 
 
+@contextmanager
+def pooled_connection():
+    """
+    Check out a connection to Databricks SQL warehouse from the shared pool.
+
+    The connection goes back to the pool when the block exits, or is
+    discarded if the block raises, so callers should close their cursors
+    but not the connection itself.
+
+    Yields:
+        connection object if successful, None otherwise
+
+    Example:
+        >>> with pooled_connection() as connection:
+        ...     with connection.cursor() as cursor:
+        ...         cursor.execute("SELECT * FROM catalog.schema.table LIMIT 10")
+        ...         df = cursor.fetchall_arrow().to_pandas()
+    """
+    pool = _get_connection_pool()
+    try:
+        connection = pool.acquire()
+    except ImportError:
+        print("databricks-sql-connector not installed. Run: pip install databricks-sql-connector")
+        connection = None
+    except Exception as e:
+        print(f"Error connecting to Databricks: {e}")
+        connection = None
+
+    if connection is None:
+        yield None
+        return
+
+    try:
+        yield connection
+    except Exception:
+        # The session may be expired or broken; never hand it out again
+        _close_quietly(connection)
+        raise
+    else:
+        pool.release(connection)
+
+
 def query_databricks_table(
     catalog: str,
     schema: str,
     table: str,
     limit: Optional[int] = None,
-    filters: Optional[str] = None
-) -> Optional[pd.DataFrame]:
+    filters: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    parameters: Optional[Dict[str, Any]] = None
+) -> Optional[pa.Table]:
     """
-    Query a Databricks table and return as pandas DataFrame.
+    Query a Databricks table and return as an Arrow table.
+
+    Results stay columnar; call ``.to_pandas()`` on the result only where a
+    pandas DataFrame is actually needed.
 
     Args:
         catalog: Unity Catalog name
@@ -56,53 +180,56 @@ def query_databricks_table(
         table: Table name
         limit: Optional row limit
         filters: Optional WHERE clause (without the WHERE keyword)
+        columns: Optional list of columns to select (defaults to all columns)
+        parameters: Optional values for named :param markers used in filters
 
     Returns:
-        pandas DataFrame or None if query fails
+        pyarrow Table or None if query fails
 
     Example:
-        >>> df = query_databricks_table(
+        >>> table = query_databricks_table(
         ...     catalog="main",
         ...     schema="sales",
         ...     table="transactions",
         ...     limit=1000,
-        ...     filters="date >= '2024-01-01'"
+        ...     filters="date >= :start_date",
+        ...     columns=["date", "product", "amount"],
+        ...     parameters={"start_date": "2024-01-01"}
         ... )
+        >>> df = table.to_pandas() if table is not None else None
     """
-    connection = get_databricks_connection()
-    if connection is None:
-        return None
-
-    try:
-        query = f"SELECT * FROM {catalog}.{schema}.{table}"
+    projection = ", ".join(columns) if columns else "*"
+    query = f"SELECT {projection} FROM {catalog}.{schema}.{table}"
 
-        if filters:
-            query += f" WHERE {filters}"
+    if filters:
+        query += f" WHERE {filters}"
 
-        if limit:
-            query += f" LIMIT {limit}"
+    if limit:
+        query += f" LIMIT {limit}"
 
-        cursor = connection.cursor()
-        cursor.execute(query)
-        df = cursor.fetchall_arrow().to_pandas()
-        cursor.close()
-        connection.close()
+    try:
+        with pooled_connection() as connection:
+            if connection is None:
+                return None
 
-        return df
+            with connection.cursor() as cursor:
+                cursor.execute(query, parameters)
+                return cursor.fetchall_arrow()
     except Exception as e:
         print(f"Error querying table: {e}")
         return None
 
 
-def execute_sql_query(query: str) -> Optional[pd.DataFrame]:
+def execute_sql_query(query: str, parameters: Optional[Dict[str, Any]] = None) -> Optional[pa.Table]:
     """
-    Execute a custom SQL query and return results as DataFrame.
+    Execute a custom SQL query and return results as an Arrow table.
 
     Args:
         query: SQL query string
+        parameters: Optional values for named :param markers used in the query
 
     Returns:
-        pandas DataFrame or None if query fails
+        pyarrow Table or None if query fails
 
     Example:
         >>> query = '''
@@ -110,20 +237,17 @@ def execute_sql_query(query: str) -> Optional[pd.DataFrame]:
         ...     FROM catalog.schema.sales
         ...     GROUP BY region
         ... '''
-        >>> df = execute_sql_query(query)
+        >>> table = execute_sql_query(query)
+        >>> df = table.to_pandas() if table is not None else None
     """
-    connection = get_databricks_connection()
-    if connection is None:
-        return None
-
     try:
-        cursor = connection.cursor()
-        cursor.execute(query)
-        df = cursor.fetchall_arrow().to_pandas()
-        cursor.close()
-        connection.close()
+        with pooled_connection() as connection:
+            if connection is None:
+                return None
 
-        return df
+            with connection.cursor() as cursor:
+                cursor.execute(query, parameters)
+                return cursor.fetchall_arrow()
     except Exception as e:
         print(f"Error executing query: {e}")
         return None